@@ -1,3 +1,4 @@
+import sys
 from abc import ABC, abstractmethod
 
 #======================================================================================================
@@ -90,8 +91,11 @@ def build_ui(factory: UIFactory):
     for component in components:
         print(component.render())
 
+# The dynamic section below reuses these names; keep handles for the benchmarks
+StaticUIFactory, StaticLightFactory, StaticDarkFactory = UIFactory, LightFactory, DarkFactory
+
 # === Usage ===
-if __name__ == "__main__":
+if __name__ == "__main__" and "--bench" not in sys.argv:
     
     print("========= Static Factory =========")
     
@@ -105,69 +109,233 @@ if __name__ == "__main__":
 # Dynamic Factory
 #======================================================================================================
 
+import importlib
 from abc import ABC, abstractmethod
 
 # === Abstract Product ===
 class UIComponent(ABC):
+    # Pure components hold no per-instance state and always render the same
+    # output, so factories may share one instance and cache its rendering.
+    pure = False
+
     @abstractmethod
     def render(self):
         pass
 
 # === Concrete Products ===
 class LightButton(UIComponent):
+    pure = True
     def render(self): return "Light Button rendered"
 
 class DarkButton(UIComponent):
+    pure = True
     def render(self): return "Dark Button rendered"
 
 class LightCheckbox(UIComponent):
+    pure = True
     def render(self): return "Light Checkbox rendered"
 
 class DarkCheckbox(UIComponent):
+    pure = True
     def render(self): return "Dark Checkbox rendered"
 
 class LightSlider(UIComponent):
+    pure = True
     def render(self): return "Light Slider rendered"
 
 class DarkSlider(UIComponent):
+    pure = True
     def render(self): return "Dark Slider rendered"
 
 # === Abstract Factory ===
+# factory.py has an identical copy: the pattern directories have hyphenated
+# names, so they can't be imported as packages to share one helper.
+def _import_string(path: str):
+    """Resolve 'package.module.Class' or 'package.module:Class' to the object it names."""
+    module_name, sep, attr = path.partition(":")
+    if not sep:
+        module_name, _, attr = path.rpartition(".")
+    if not module_name or not attr:
+        raise ValueError(f"Invalid import path: '{path}'")
+    return getattr(importlib.import_module(module_name), attr)
+
 class UIFactory:
+    theme = None
+    components = {}  # declarative theme table: name -> creator or import path
+    _compiled_creators = {}
+    _compiled_loaders = {}
+
+    # Concrete factory classes by theme name, filled in by __init_subclass__
+    _themes = {}
+
+    # name -> [shared pure instance, cached render or None]. Named themes share
+    # one table per class, so a theme's pure widgets exist exactly once; other
+    # factories (plain UIFactory(), ad-hoc subclasses) keep their own.
+    _shared_pure = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Compile the theme table once per class instead of once per instance
+        cls._compiled_creators = {}
+        cls._compiled_loaders = {}
+        for name, creator in cls.components.items():
+            if isinstance(creator, str):
+                cls._compiled_loaders[name] = creator
+            else:
+                cls._compiled_creators[name] = creator
+        cls._shared_pure = {} if cls.theme is not None else None
+        # Only a class that declares its own theme registers it; `theme` is
+        # inherited, so subclasses of a theme must not silently replace it
+        if cls.__dict__.get("theme") is not None:
+            if cls.theme in UIFactory._themes:
+                raise ValueError(f"Theme '{cls.theme}' is already registered by {UIFactory._themes[cls.theme].__name__}")
+            UIFactory._themes[cls.theme] = cls
+
     def __init__(self):
-        self._creators = {}  # registry for component creators
+        # Start out sharing the compiled tables; copied on the first registration
+        self._creators = self._compiled_creators  # registry for component creators
+        self._loaders = self._compiled_loaders    # name -> import path or zero-arg loader, resolved on first create
+        self._owns_tables = False
+        self._pure = self._shared_pure if self._shared_pure is not None else {}
+
+    def _own_tables(self):
+        if not self._owns_tables:
+            self._creators = dict(self._creators)
+            self._loaders = dict(self._loaders)
+            self._pure = {}  # customised factories must not touch the theme's shared widgets
+            self._owns_tables = True
 
     def register_component(self, name: str, creator):
+        # A string is a dotted import path; nothing is imported until first use
+        if isinstance(creator, str):
+            self.register_component_loader(name, creator)
+            return
+        self._own_tables()
+        self._pure.pop(name, None)
+        self._loaders.pop(name, None)
         self._creators[name] = creator
 
+    def register_component_loader(self, name: str, loader):
+        """Register an import path or a zero-arg callable that returns the creator."""
+        self._own_tables()
+        self._pure.pop(name, None)
+        self._creators.pop(name, None)
+        self._loaders[name] = loader
+
     def create(self, name: str) -> UIComponent:
-        if name not in self._creators:
+        entry = self._pure.get(name)
+        if entry is not None:
+            return entry[0]
+
+        creator = self._creators.get(name)
+        if creator is None:
+            creator = self._resolve(name)
+        if getattr(creator, "pure", False):
+            entry = self._pure[name] = [creator(), None]
+            return entry[0]
+        return creator()
+
+    def render(self, name: str) -> str:
+        """Render a component by name, reusing the cached output of pure components."""
+        entry = self._pure.get(name)
+        if entry is None:
+            component = self.create(name)  # caches the entry if the component is pure
+            entry = self._pure.get(name)
+            if entry is None:
+                return component.render()
+        if entry[1] is None:
+            entry[1] = entry[0].render()
+        return entry[1]
+
+    def _resolve(self, name: str):
+        if name not in self._loaders:
             raise ValueError(f"No component registered for '{name}'")
-        return self._creators[name]()
+        loader = self._loaders[name]
+        creator = _import_string(loader) if isinstance(loader, str) else loader()
+        # Cache the resolved creator so the import only ever happens once. When
+        # the tables are still the compiled ones, every instance benefits.
+        self._creators[name] = creator
+        self._loaders.pop(name, None)
+        return creator
 
 # === Concrete Factories as Classes ===
 class LightFactory(UIFactory):
-    def __init__(self):
-        super().__init__()
-        self.register_component("button", LightButton)
-        self.register_component("checkbox", LightCheckbox)
-        self.register_component("slider", LightSlider)
+    theme = "light"
+    components = {
+        "button": LightButton,
+        "checkbox": LightCheckbox,
+        "slider": LightSlider,
+    }
 
 class DarkFactory(UIFactory):
-    def __init__(self):
-        super().__init__()
-        self.register_component("button", DarkButton)
-        self.register_component("checkbox", DarkCheckbox)
-        self.register_component("slider", DarkSlider)
+    theme = "dark"
+    components = {
+        "button": DarkButton,
+        "checkbox": DarkCheckbox,
+        "slider": DarkSlider,
+    }
+
+# === Theme Switching ===
+class ThemeRegistry:
+    """
+    Holds one factory per theme and the currently active one. Switching
+    themes only swaps the `active` reference; components built through
+    the registry pick up the new theme the next time they render.
+    """
+
+    def __init__(self, theme: str | None = None):
+        self._factories = {}
+        self.active = None
+        if theme is not None:
+            self.switch(theme)
+
+    def factory(self, theme: str) -> UIFactory:
+        # Factories are instantiated on first use and then reused
+        factory = self._factories.get(theme)
+        if factory is None:
+            if theme not in UIFactory._themes:
+                raise ValueError(f"No theme registered as '{theme}'")
+            factory = self._factories[theme] = UIFactory._themes[theme]()
+        return factory
+
+    def switch(self, theme: str) -> None:
+        self.active = self.factory(theme)
+
+    def build(self, components) -> list:
+        return [ThemedComponent(self, name) for name in components]
+
+class ThemedComponent(UIComponent):
+    """Theme-independent handle that re-skins itself lazily after a switch."""
+
+    def __init__(self, registry: ThemeRegistry, name: str):
+        self._registry = registry
+        self.name = name
+        self._factory = None
+        self._component = None
+
+    def render(self):
+        factory = self._registry.active
+        if factory is not self._factory:
+            # Only handles that are actually rendered get re-resolved
+            self._factory = factory
+            self._component = factory.create(self.name)
+        if self._component.pure:
+            return factory.render(self.name)
+        return self._component.render()
 
 # === Client ===
-def build_ui(factory: UIFactory, components):
+def build_ui(factory: UIFactory, components, batched: bool = False, file=None):
+    if batched:
+        # Render the whole screen into one buffer and write it with a single call
+        print("\n".join([factory.render(name) for name in components]), file=file)
+        return
+
     for name in components:
         component = factory.create(name)
-        print(component.render())
+        print(component.render(), file=file)
 
 # === Usage ===
-if __name__ == "__main__":
+if __name__ == "__main__" and "--bench" not in sys.argv:
     
     print("\n========= Dynamic Factory =========")
     
@@ -178,3 +346,151 @@ if __name__ == "__main__":
 
     print("\nDark Mode UI:")
     build_ui(DarkFactory(), component_list)
+
+    print("\nBatched Light Mode UI:")
+    build_ui(LightFactory(), component_list * 2, batched=True)
+
+    print("\nLive theme switch:")
+    registry = ThemeRegistry("light")
+    screen = registry.build(component_list)
+    print("\n".join(component.render() for component in screen))
+    registry.switch("dark")  # same component tree, re-skinned on render
+    print("\n".join(component.render() for component in screen))
+
+    print("\nLazily registered component:")
+    factory = LightFactory()
+    factory.register_component_loader("toggle", lambda: LightCheckbox)  # resolved on first create
+    build_ui(factory, ["toggle"])
+
+#======================================================================================================
+# Benchmarks: static vs dynamic factory creation overhead
+#======================================================================================================
+
+import json
+import platform
+import timeit
+import tracemalloc
+
+_STATIC_METHODS = {"button": "create_button", "checkbox": "create_checkbox", "slider": "create_slider"}
+
+def _dynamic_factory_class(registry_size: int, pure: bool = True):
+    # Pad the three real widgets with filler entries to grow the registry
+    components = dict(LightFactory.components)
+    for i in range(registry_size - len(components)):
+        components[f"filler{i}"] = LightButton
+    if not pure:
+        components = {
+            name: type(f"Impure{creator.__name__}", (creator,), {"pure": False})
+            for name, creator in components.items()
+        }
+    return type(f"BenchFactory{registry_size}", (UIFactory,), {"components": components})
+
+def _time_per_op(func, ops_per_call: int, repeat: int) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number / ops_per_call * 1e9
+
+def _allocations(func) -> tuple[int, int]:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        result = func()  # keep the created objects alive while measuring
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    stats = after.compare_to(before, "filename")
+    return sum(stat.count_diff for stat in stats), sum(stat.size_diff for stat in stats)
+
+def run_benchmarks(widget_counts=(10, 100, 1000), registry_sizes=(3, 100, 1000), repeat: int = 3) -> dict:
+    """
+    Measure factory construction cost, per-create latency and allocations for
+    the static and dynamic designs. Returns a JSON-serialisable dict whose
+    `results` records are keyed by (design, benchmark, widgets, registry_size).
+    Allocations are measured over `alloc_ops` operations and reported per op,
+    so records with different loop sizes are comparable.
+    """
+    results = []
+
+    def record(design, benchmark, widgets, registry_size, ns_per_op, func=None, ops=1):
+        blocks, size = _allocations(func) if func else (None, None)
+        results.append({
+            "design": design,
+            "benchmark": benchmark,
+            "widgets": widgets,
+            "registry_size": registry_size,
+            "ns_per_op": round(ns_per_op, 1),
+            "alloc_ops": ops if func else None,
+            "alloc_blocks_per_op": round(blocks / ops, 2) if func else None,
+            "alloc_bytes_per_op": round(size / ops, 1) if func else None,
+        })
+
+    # Factory construction
+    record("static", "construct", None, 3, _time_per_op(StaticLightFactory, 1, repeat),
+           lambda: [StaticLightFactory() for _ in range(1000)], ops=1000)
+    for registry_size in registry_sizes:
+        factory_cls = _dynamic_factory_class(registry_size)
+        record("dynamic", "construct", None, registry_size, _time_per_op(factory_cls, 1, repeat),
+               lambda: [factory_cls() for _ in range(1000)], ops=1000)
+
+        def register_each():
+            factory = UIFactory()
+            for name, creator in factory_cls.components.items():
+                factory.register_component(name, creator)
+            return factory
+        record("dynamic_register", "construct", None, registry_size,
+               _time_per_op(register_each, 1, repeat), lambda: [register_each() for _ in range(100)], ops=100)
+
+    # Per-create latency over screens of different sizes
+    names = list(_STATIC_METHODS)
+    for widgets in widget_counts:
+        screen = [names[i % len(names)] for i in range(widgets)]
+
+        static_factory = StaticLightFactory()
+        static_calls = [getattr(static_factory, _STATIC_METHODS[name]) for name in screen]
+        static_create = lambda: [create() for create in static_calls]
+        record("static", "create", widgets, 3, _time_per_op(static_create, widgets, repeat),
+               static_create, ops=widgets)
+
+        for registry_size in registry_sizes:
+            for design, pure in (("dynamic", True), ("dynamic_uncached", False)):
+                factory = _dynamic_factory_class(registry_size, pure=pure)()
+                create = factory.create
+                dynamic_create = lambda: [create(name) for name in screen]
+                record(design, "create", widgets, registry_size,
+                       _time_per_op(dynamic_create, widgets, repeat), dynamic_create, ops=widgets)
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "results": results,
+    }
+
+def compare_benchmarks(baseline: dict, current: dict, tolerance: float = 0.25) -> list[str]:
+    """List the records of `current` that are more than `tolerance` slower than `baseline`."""
+    def key(result):
+        return result["design"], result["benchmark"], result["widgets"], result["registry_size"]
+
+    previous = {key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = previous.get(key(result))
+        if old and result["ns_per_op"] > old["ns_per_op"] * (1 + tolerance):
+            regressions.append(
+                f"{key(result)}: {old['ns_per_op']} ns -> {result['ns_per_op']} ns"
+            )
+    return regressions
+
+if __name__ == "__main__" and "--bench" in sys.argv:
+    # Usage: python abstract_factory.py --bench [baseline.json] > results.json
+    report = run_benchmarks()
+    print(json.dumps(report, indent=2))
+
+    baseline_paths = [arg for arg in sys.argv[1:] if arg != "--bench"]
+    if baseline_paths:
+        with open(baseline_paths[0]) as f:
+            regressions = compare_benchmarks(json.load(f), report)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
@@ -1,23 +1,37 @@
+import csv
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import ClassVar
+
 #==========================
 # Product
 #==========================
 class Pizza:
+    # Bulk intake creates pizzas by the thousand; skip the per-instance __dict__
+    __slots__ = ("size", "crust", "toppings")
+
     def __init__(self):
         self.size = None
         self.crust = None
         self.toppings = []
 
     def display(self):
-        size = self.size or "Default size"
-        crust = self.crust or "Default crust"
-        toppings = ", ".join(self.toppings) if self.toppings else "No toppings"
-
-        return (
-            f"Pizza details:\n"
-            f"- Size: {size}\n"
-            f"- Crust: {crust}\n"
-            f"- Toppings: {toppings}"
-        )
+        return _describe_pizza(self.size, self.crust, self.toppings)
+
+def _describe_pizza(size, crust, toppings):
+    size = size or "Default size"
+    crust = crust or "Default crust"
+    toppings = ", ".join(toppings) if toppings else "No toppings"
+
+    return (
+        f"Pizza details:\n"
+        f"- Size: {size}\n"
+        f"- Crust: {crust}\n"
+        f"- Toppings: {toppings}"
+    )
 
 #==========================
 # Builder
@@ -26,6 +40,13 @@ class PizzaBuilder:
     VALID_SIZES = {"Small", "Medium", "Large"}
     VALID_CRUSTS = {"Thin", "Thick", "Stuffed"}
 
+    # Precompiled lookup tables for build_many(): accepted spelling -> canonical value.
+    # Bulk intake is deliberately case-insensitive ("small", "THIN") because order
+    # exports rarely match the menu's capitalisation; set_size()/set_crust() stay strict.
+    _SIZE_LOOKUP = {**{size: size for size in VALID_SIZES}, **{size.lower(): size for size in VALID_SIZES}}
+    _CRUST_LOOKUP = {**{crust: crust for crust in VALID_CRUSTS}, **{crust.lower(): crust for crust in VALID_CRUSTS}}
+    _TOPPINGS_CACHE_SIZE = 1024
+
     def __init__(self):
         self.reset()
 
@@ -62,38 +83,260 @@ class PizzaBuilder:
         self.reset()
         return pizza
 
+    def build_many(self, specs, on_error=None, as_tuples=False):
+        """
+        Lazily build one pizza per order spec.
+
+        Each spec is a mapping with optional "size", "crust" and "toppings"
+        keys (toppings may be a list or a ";"-separated string, as in CSV).
+        Unlike set_size()/set_crust(), size and crust are matched
+        case-insensitively and normalised to the canonical spelling.
+        Invalid rows are reported through on_error(index, spec, reason) and
+        skipped, so one bad row never aborts the stream. With as_tuples=True
+        the generator yields (size, crust, toppings) tuples instead of Pizza
+        objects.
+        """
+        sizes = self._SIZE_LOOKUP
+        crusts = self._CRUST_LOOKUP
+        # Bounded cache of parsed topping strings, so memory stays flat
+        # however many rows pass through
+        parsed_toppings = {}
+
+        for index, spec in enumerate(specs):
+            try:
+                if not isinstance(spec, dict):
+                    raise ValueError(f"Order spec must be a mapping, got {type(spec).__name__}")
+
+                size = spec.get("size") or None
+                if size is not None:
+                    size = sizes.get(str(size)) or sizes.get(str(size).strip().lower())
+                    if size is None:
+                        raise ValueError(f"Invalid size: {spec['size']}")
+
+                crust = spec.get("crust") or None
+                if crust is not None:
+                    crust = crusts.get(str(crust)) or crusts.get(str(crust).strip().lower())
+                    if crust is None:
+                        raise ValueError(f"Invalid crust: {spec['crust']}")
+
+                raw_toppings = spec.get("toppings") or ()
+                toppings = parsed_toppings.get(raw_toppings) if isinstance(raw_toppings, str) else None
+                if toppings is None:
+                    toppings = self._parse_toppings(raw_toppings)
+                    if isinstance(raw_toppings, str):
+                        if len(parsed_toppings) >= self._TOPPINGS_CACHE_SIZE:
+                            parsed_toppings.clear()
+                        parsed_toppings[raw_toppings] = toppings
+            except ValueError as e:
+                if on_error is not None:
+                    on_error(index, spec, str(e))
+                continue
+
+            if as_tuples:
+                yield (size, crust, toppings)
+            else:
+                pizza = Pizza()
+                pizza.size = size
+                pizza.crust = crust
+                pizza.toppings = list(toppings)
+                yield pizza
+
+    @staticmethod
+    def _parse_toppings(raw_toppings) -> tuple:
+        if isinstance(raw_toppings, str):
+            raw_toppings = raw_toppings.split(";")
+        elif not isinstance(raw_toppings, (list, tuple)):
+            raise ValueError(f"Toppings must be a list or a ';'-separated string, got {type(raw_toppings).__name__}")
+        toppings = []
+        for topping in raw_toppings:
+            if not isinstance(topping, str) or not topping.strip():
+                raise ValueError("Topping must be a non-empty string")
+            toppings.append(topping.strip())
+        return tuple(toppings)
+
+#==========================
+# Order readers
+#==========================
+def read_orders_csv(lines):
+    """Yield order specs from CSV lines with a size,crust,toppings header."""
+    yield from csv.DictReader(lines)
+
+def read_orders_jsonl(lines):
+    """Yield one order spec per JSONL line; undecodable lines are passed through as-is."""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            yield line  # build_many() reports it as an invalid row
+
+#==========================
+# Recipe (immutable, interned)
+#==========================
+@dataclass(frozen=True, slots=True)
+class PizzaRecipe:
+    """
+    Frozen pizza template. Menu templates are interned, so popular menu
+    items exist once; customising returns a new, uninterned recipe that
+    shares every field it doesn't change, so one-off orders never pile up
+    in the intern table.
+    """
+    size: str | None
+    crust: str | None
+    toppings: tuple = ()
+
+    _interned: ClassVar[dict] = {}
+
+    @classmethod
+    def get(cls, size, crust, toppings=()):
+        """Return the interned recipe; meant for the finite set of menu templates."""
+        key = (size, crust, tuple(toppings))
+        recipe = cls._interned.get(key)
+        if recipe is None:
+            recipe = cls._interned[key] = cls(*key)
+        return recipe
+
+    @classmethod
+    def from_pizza(cls, pizza: Pizza):
+        return cls.get(pizza.size, pizza.crust, pizza.toppings)
+
+    def customise(self, size=None, crust=None, add=(), remove=()):
+        changes = {}
+        if size is not None and size != self.size:
+            if size not in PizzaBuilder.VALID_SIZES:
+                raise ValueError(f"Invalid size: {size}")
+            changes["size"] = size
+        if crust is not None and crust != self.crust:
+            if crust not in PizzaBuilder.VALID_CRUSTS:
+                raise ValueError(f"Invalid crust: {crust}")
+            changes["crust"] = crust
+        if isinstance(add, str) or isinstance(remove, str):
+            raise ValueError("add and remove take a list of toppings, not a single string")
+        # Materialise once: either may be a one-shot iterator such as a generator
+        add, remove = tuple(add), frozenset(remove)
+        if add or remove:
+            for topping in add:
+                if not topping or not isinstance(topping, str):
+                    raise ValueError("Topping must be a non-empty string")
+            changes["toppings"] = tuple(t for t in self.toppings if t not in remove) + add
+        if not changes:
+            return self
+
+        # Unchanged fields (including the toppings tuple) are shared, not copied
+        return type(self)(
+            changes.get("size", self.size),
+            changes.get("crust", self.crust),
+            changes.get("toppings", self.toppings),
+        )
+
+    def to_pizza(self) -> Pizza:
+        """Return a mutable Pizza for callers that need to keep editing it."""
+        pizza = Pizza()
+        pizza.size = self.size
+        pizza.crust = self.crust
+        pizza.toppings = list(self.toppings)
+        return pizza
+
+    def display(self):
+        return _describe_pizza(self.size, self.crust, self.toppings)
+
 #==========================
 # Director
 #==========================
 class PizzaDirector:
     def __init__(self, builder):
         self.builder = builder
+        self._recipes = {}  # menu item -> interned PizzaRecipe, built on first order
+
+    def _recipe(self, name, steps):
+        recipe = self._recipes.get(name)
+        if recipe is None:
+            recipe = self._recipes[name] = PizzaRecipe.from_pizza(steps(self.builder).build())
+        return recipe
 
     def margherita(self):
-        return (
-            self.builder
+        return self._recipe("margherita", lambda builder: (
+            builder
             .set_size("Medium")
             .set_crust("Thin")
             .add_topping("Mozzarella")
             .add_topping("Basil")
-            .build()
-        )
+        ))
 
     def pepperoni(self):
-        return (
-            self.builder
+        return self._recipe("pepperoni", lambda builder: (
+            builder
             .set_size("Large")
             .set_crust("Thick")
             .add_topping("Mozzarella")
             .add_topping("Pepperoni")
-            .build()
-        )
+        ))
+
+#==========================
+# Benchmark
+#==========================
+def benchmark_build_many(orders: int = 200_000):
+    def order_lines():
+        yield "size,crust,toppings\n"
+        for i in range(orders):
+            yield f"{('Small', 'medium', 'LARGE')[i % 3]},Thin,Mozzarella;Basil;Olives\n"
+
+    builder = PizzaBuilder()
+
+    # One builder call chain per order, materialised as a list
+    tracemalloc.start()
+    started = time.perf_counter()
+    pizzas = []
+    for spec in read_orders_csv(order_lines()):
+        builder.set_size(spec["size"].capitalize()).set_crust(spec["crust"])
+        for topping in spec["toppings"].split(";"):
+            builder.add_topping(topping)
+        pizzas.append(builder.build())
+    chained = time.perf_counter() - started
+    chained_peak = tracemalloc.get_traced_memory()[1]
+    del pizzas
+    tracemalloc.stop()
+
+    # Streaming pipeline, consumed one pizza at a time
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = sum(1 for _ in builder.build_many(read_orders_csv(order_lines())))
+    streamed = time.perf_counter() - started
+    streamed_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(f"chained builder: {orders} orders in {chained:.2f}s, peak {chained_peak / 1e6:.1f} MB")
+    print(f"build_many:      {count} orders in {streamed:.2f}s, peak {streamed_peak / 1e6:.3f} MB")
 
 #==========================
 # Usage
 #==========================
-builder = PizzaBuilder()
-director = PizzaDirector(builder)
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_build_many()
+        sys.exit()
+
+    builder = PizzaBuilder()
+    director = PizzaDirector(builder)
+
+    pizza = director.margherita()
+    print(pizza.display())
+
+    # Menu items are shared templates; customising copies only what changes
+    large = director.margherita().customise(size="Large")
+    print(large.display())
+    print("Same template served twice:", director.margherita() is PizzaDirector(builder).margherita())
+    print("Toppings shared with the template:", large.toppings is pizza.toppings)
 
-pizza = director.margherita()
-print(pizza.display())
+    print("\nBulk orders:")
+    orders = [
+        "size,crust,toppings",
+        "Large,Thick,Mozzarella;Pepperoni",
+        "small,thin,",
+        "Huge,Thin,Mozzarella",
+        "Medium,Stuffed,Ham;Pineapple",
+    ]
+    report = lambda index, spec, reason: print(f"Row {index} rejected: {reason}")
+    for pizza in builder.build_many(read_orders_csv(orders), on_error=report):
+        print(pizza.display())
@@ -1,4 +1,12 @@
+import importlib
+import os
+import sys
+import tempfile
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # ----- Step 1: Notification interface -----
 class Notification(ABC):
@@ -6,6 +14,11 @@ class Notification(ABC):
     def send(self, message: str):
         pass
 
+    def send_batch(self, messages: list[str]):
+        # Default batch hook: channels without a bulk API fall back to send()
+        for message in messages:
+            self.send(message)
+
 # ----- Step 2: Concrete notifications -----
 class EmailNotification(Notification):
     def send(self, message: str):
@@ -19,33 +32,308 @@ class WhatsAppNotification(Notification):
     def send(self, message: str):
         print(f"Sending WhatsApp message: {message}")
 
+class ConsoleNotification(Notification):
+    def send(self, message: str):
+        print(f"Console: {message}")
+
 # ----- Step 3: Instance-based Notification Factory -----
+# abstract_factory.py has an identical copy: the pattern directories have hyphenated
+# names, so they can't be imported as packages to share one helper.
+def _import_string(path: str):
+    """Resolve 'package.module.Class' or 'package.module:Class' to the object it names."""
+    module_name, sep, attr = path.partition(":")
+    if not sep:
+        module_name, _, attr = path.rpartition(".")
+    if not module_name or not attr:
+        raise ValueError(f"Invalid import path: '{path}'")
+    return getattr(importlib.import_module(module_name), attr)
+
+
 class NotificationFactory:
     def __init__(self):
         self._creators = {}
+        self._loaders = {}  # type_name -> import path or zero-arg loader, resolved on first create
 
     def register_notification(self, type_name: str, creator):
+        # A string is a dotted import path; nothing is imported until first use
+        if isinstance(creator, str):
+            self.register_notification_loader(type_name, creator)
+            return
+        self._loaders.pop(type_name, None)
         self._creators[type_name] = creator
 
+    def register_notification_loader(self, type_name: str, loader):
+        """Register an import path or a zero-arg callable that returns the creator."""
+        self._creators.pop(type_name, None)
+        self._loaders[type_name] = loader
+
     def create_notification(self, type_name: str) -> Notification:
-        if type_name not in self._creators:
+        creator = self._creators.get(type_name)
+        if creator is None:
+            creator = self._resolve(type_name)
+        return creator()
+
+    def _resolve(self, type_name: str):
+        if type_name not in self._loaders:
             raise ValueError(f"Notification type '{type_name}' not registered.")
-        return self._creators[type_name]()
+        loader = self._loaders[type_name]
+        creator = _import_string(loader) if isinstance(loader, str) else loader()
+        # Cache the resolved creator so the import only ever happens once
+        del self._loaders[type_name]
+        self._creators[type_name] = creator
+        return creator
+
+# ----- Step 4: Bulk dispatcher -----
+class ChannelStats:
+    """Per-channel delivery report produced by NotificationDispatcher."""
+
+    def __init__(self, type_name: str):
+        self.type_name = type_name
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self) -> float:
+        # Messages per second over the channel's busy window
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self):
+        return (f"ChannelStats(type={self.type_name!r}, sent={self.sent}, "
+                f"failed={self.failed}, batches={self.batches}, "
+                f"throughput={self.throughput:.1f}/s)")
+
+
+class NotificationDispatcher:
+    """
+    Groups a stream of (type, message) requests by registered type and hands
+    each channel whole batches through send_batch(). Every channel gets its
+    own worker pool, so a slow channel never blocks the others and
+    `concurrency` caps how many batches a single channel runs at once.
+
+    The request stream is consumed lazily: once a channel has
+    `max_queued_batches` batches waiting behind its running ones, reading
+    stops until that channel's oldest batch finishes, so memory stays
+    bounded however long the stream is.
+    """
+
+    def __init__(self, factory: NotificationFactory, batch_size: int = 100,
+                 concurrency: dict[str, int] | None = None, default_concurrency: int = 1,
+                 max_queued_batches: int = 2):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if max_queued_batches < 0:
+            raise ValueError("max_queued_batches must not be negative")
+        self._factory = factory
+        self._batch_size = batch_size
+        self._concurrency = concurrency or {}
+        self._default_concurrency = default_concurrency
+        self._max_queued_batches = max_queued_batches
+
+    def dispatch(self, requests) -> dict[str, ChannelStats]:
+        stats = {}
+        pending = {}   # type_name -> messages waiting for a full batch
+        channels = {}  # type_name -> (notification, executor, in-flight futures, cap), or None if unregistered
+        windows = {}   # type_name -> [first batch start, last batch end]
+        lock = threading.Lock()
+
+        def run_batch(type_name, notification, batch):
+            started = time.perf_counter()
+            try:
+                notification.send_batch(batch)
+                error = None
+            except Exception as exc:  # isolate failures to this batch
+                error = exc
+            finished = time.perf_counter()
+
+            with lock:
+                channel_stats = stats[type_name]
+                channel_stats.batches += 1
+                if error is None:
+                    channel_stats.sent += len(batch)
+                else:
+                    channel_stats.failed += len(batch)
+                    channel_stats.errors.append(error)
+                window = windows.setdefault(type_name, [started, finished])
+                window[0] = min(window[0], started)
+                window[1] = max(window[1], finished)
+
+        def submit(type_name, batch):
+            channel = channels[type_name]
+            if channel is None:
+                stats[type_name].failed += len(batch)
+                return
+            notification, executor, in_flight, cap = channel
+            # Backpressure: wait for the oldest batch before queueing past the cap.
+            # result() also re-raises anything run_batch couldn't catch.
+            while in_flight and (in_flight[0].done() or len(in_flight) >= cap):
+                in_flight.popleft().result()
+            in_flight.append(executor.submit(run_batch, type_name, notification, batch))
+
+        try:
+            for type_name, message in requests:
+                if type_name not in channels:
+                    stats[type_name] = ChannelStats(type_name)
+                    try:
+                        notification = self._factory.create_notification(type_name)
+                    except (ValueError, ImportError, AttributeError) as exc:
+                        # Unregistered type or a lazy import path that doesn't resolve
+                        stats[type_name].errors.append(exc)
+                        channels[type_name] = None
+                    else:
+                        workers = self._concurrency.get(type_name, self._default_concurrency)
+                        channels[type_name] = (notification, ThreadPoolExecutor(max_workers=workers),
+                                               deque(), workers + self._max_queued_batches)
+
+                batch = pending.setdefault(type_name, [])
+                batch.append(message)
+                if len(batch) >= self._batch_size:
+                    submit(type_name, batch)
+                    pending[type_name] = []
+
+            # Flush the partial batches left at the end of the stream
+            for type_name, batch in pending.items():
+                if batch:
+                    submit(type_name, batch)
+            for channel in channels.values():
+                if channel is not None:
+                    for future in channel[2]:
+                        future.result()
+        finally:
+            for channel in channels.values():
+                if channel is not None:
+                    channel[1].shutdown(wait=True)
+
+        for type_name, (started, finished) in windows.items():
+            stats[type_name].elapsed = finished - started
+        return stats
+
+# ----- Step 5: Local fake channel for benchmarking -----
+class FakeChannel(Notification):
+    """Simulates a remote channel with a fixed per-call and per-message cost."""
+
+    def __init__(self, call_latency: float = 0.002, message_latency: float = 0.0):
+        self.call_latency = call_latency
+        self.message_latency = message_latency
+
+    def send(self, message: str):
+        time.sleep(self.call_latency + self.message_latency)
+
+    def send_batch(self, messages: list[str]):
+        # One round trip for the whole batch
+        time.sleep(self.call_latency + self.message_latency * len(messages))
+
+
+def benchmark_dispatcher(messages_per_channel: int = 500, channel_count: int = 3):
+    factory = NotificationFactory()
+    type_names = [f"fake{i}" for i in range(channel_count)]
+    for type_name in type_names:
+        factory.register_notification(type_name, FakeChannel)
+
+    def stream():
+        for i in range(messages_per_channel):
+            for type_name in type_names:
+                yield type_name, f"message {i}"
+
+    total = messages_per_channel * channel_count
+
+    # Baseline: the serial create-and-send loop
+    started = time.perf_counter()
+    for type_name, message in stream():
+        factory.create_notification(type_name).send(message)
+    serial = time.perf_counter() - started
+    print(f"serial send():  {total} messages in {serial:.3f}s ({total / serial:.0f}/s)")
+
+    for batch_size, workers in [(1, 4), (50, 1), (50, 4)]:
+        dispatcher = NotificationDispatcher(factory, batch_size=batch_size, default_concurrency=workers)
+        started = time.perf_counter()
+        stats = dispatcher.dispatch(stream())
+        elapsed = time.perf_counter() - started
+        print(f"dispatcher(batch={batch_size}, workers={workers}): "
+              f"{total} messages in {elapsed:.3f}s ({total / elapsed:.0f}/s)")
+        for channel_stats in stats.values():
+            print(f"    {channel_stats}")
+
+def benchmark_lazy_registration(plugin_count: int = 300):
+    # Write throwaway plugin modules so the imports are real, uncached ones
+    with tempfile.TemporaryDirectory(prefix="notification_plugins_") as plugin_dir:
+        for mode in ("eager", "lazy"):
+            for i in range(plugin_count):
+                with open(os.path.join(plugin_dir, f"{mode}_plugin_{i}.py"), "w") as f:
+                    f.write(
+                        "import json, decimal, fractions\n"
+                        f"TEMPLATES = {{n: 'tmpl-' + str(n) for n in range(200)}}\n"
+                        "class Plugin:\n"
+                        "    def send(self, message):\n"
+                        "        return message\n"
+                        "    def send_batch(self, messages):\n"
+                        "        return messages\n"
+                    )
+        sys.path.insert(0, plugin_dir)
+        importlib.invalidate_caches()
+
+        try:
+            factory = NotificationFactory()
+            started = time.perf_counter()
+            for i in range(plugin_count):
+                module = importlib.import_module(f"eager_plugin_{i}")
+                factory.register_notification(f"plugin{i}", module.Plugin)
+            eager = time.perf_counter() - started
+
+            factory = NotificationFactory()
+            started = time.perf_counter()
+            for i in range(plugin_count):
+                factory.register_notification(f"plugin{i}", f"lazy_plugin_{i}.Plugin")
+            lazy = time.perf_counter() - started
+
+            started = time.perf_counter()
+            factory.create_notification("plugin0")
+            first_create = time.perf_counter() - started
+
+            started = time.perf_counter()
+            factory.create_notification("plugin0")
+            cached_create = time.perf_counter() - started
+        finally:
+            sys.path.remove(plugin_dir)
+            # Drop the plugin modules too, so nothing points into the deleted directory
+            for mode in ("eager", "lazy"):
+                for i in range(plugin_count):
+                    sys.modules.pop(f"{mode}_plugin_{i}", None)
+
+    print(f"eager registration of {plugin_count} plugins: {eager * 1000:.2f} ms")
+    print(f"lazy registration of {plugin_count} plugins:  {lazy * 1000:.2f} ms")
+    print(f"first create (imports one plugin): {first_create * 1000:.3f} ms")
+    print(f"cached create:                     {cached_create * 1000:.3f} ms")
+
+# ----- Step 6: Demo sending notifications -----
+if __name__ == "__main__":
+    factory = NotificationFactory()
+    factory.register_notification("email", EmailNotification)
+    factory.register_notification("push", PushNotification)
+    factory.register_notification("whatsapp", WhatsAppNotification)
+    # Resolved (and cached) on the first create_notification("console")
+    factory.register_notification_loader("console", lambda: ConsoleNotification)
 
-# ----- Step 4: Create factory instance and register types -----
-factory = NotificationFactory()
-factory.register_notification("email", EmailNotification)
-factory.register_notification("push", PushNotification)
-factory.register_notification("whatsapp", WhatsAppNotification)
+    if "--bench" in sys.argv:
+        benchmark_dispatcher()
+        benchmark_lazy_registration()
+        sys.exit()
 
-# ----- Step 5: Demo sending notifications -----
-notifications_to_send = [
-    ("email", "Hello via Email!"),
-    ("push", "Hello via Push!"),
-    ("whatsapp", "Hello via WhatsApp!")
-]
+    notifications_to_send = [
+        ("email", "Hello via Email!"),
+        ("push", "Hello via Push!"),
+        ("whatsapp", "Hello via WhatsApp!"),
+        ("console", "Hello via a lazily loaded channel!")
+    ]
 
-for n_type, message in notifications_to_send:
-    notification = factory.create_notification(n_type)
-    notification.send(message)
+    for n_type, message in notifications_to_send:
+        notification = factory.create_notification(n_type)
+        notification.send(message)
 
+    print("\nBulk dispatch:")
+    dispatcher = NotificationDispatcher(factory, batch_size=2)
+    stats = dispatcher.dispatch(notifications_to_send * 2 + [("sms", "Unregistered channel")])
+    for channel_stats in stats.values():
+        print(channel_stats)
@@ -1,32 +1,93 @@
 import copy
+import sys
+import timeit
+import tracemalloc
+from array import array
+
+try:
+    import numpy as np  # optional: vectorises CharacterPool bulk updates
+except ImportError:
+    np = None
 
 class Character:
     def __init__(self, name, health, attack_power, skills=None):
-        # Validate name
+        self.name = self._validate_name(name)
+        self.health = self._validate_health(health)
+        self.attack_power = self._validate_attack_power(attack_power)
+        self.skills = self._validate_skills(skills)
+
+    @classmethod
+    def validate(cls, attribute, value):
+        """
+        Run `value` through the _validate_<attribute> rule and return the
+        value to store. Subclasses add attributes by adding rules.
+        """
+        validator = getattr(cls, f"_validate_{attribute}", None)
+        if validator is None:
+            raise ValueError(f"Unknown character attribute: '{attribute}'")
+        return validator(value)
+
+    @staticmethod
+    def _validate_name(name):
         if not isinstance(name, str) or not name.strip():
             raise ValueError("Name must be a non-empty string.")
-        self.name = name.strip()
+        return name.strip()
 
-        # Validate health
+    @staticmethod
+    def _validate_health(health):
         if not isinstance(health, (int, float)) or health < 0:
             raise ValueError("Health must be a non-negative number.")
-        self.health = health
+        return health
 
-        # Validate attack_power
+    @staticmethod
+    def _validate_attack_power(attack_power):
         if not isinstance(attack_power, (int, float)) or attack_power < 0:
             raise ValueError("Attack power must be a non-negative number.")
-        self.attack_power = attack_power
+        return attack_power
 
-        # Validate skills
+    @staticmethod
+    def _validate_skills(skills):
         if skills is None:
-            self.skills = []
-        elif isinstance(skills, list) and all(isinstance(skill, str) for skill in skills):
-            self.skills = skills.copy()  # Make a shallow copy to avoid external mutation
-        else:
-            raise ValueError("Skills must be a list of strings.")
+            return []
+        if isinstance(skills, list) and all(isinstance(skill, str) for skill in skills):
+            return skills.copy()  # Make a shallow copy to avoid external mutation
+        raise ValueError("Skills must be a list of strings.")
 
     def clone(self):
-        """Deep clone the character, ensuring independent nested structures."""
+        """
+        Clone the character, ensuring independent nested structures.
+
+        The prototype was validated when it was built, so the clone skips
+        __init__: scalars are copied as-is and skills gets its own list.
+        Skills are immutable strings, so a shallow list copy is as
+        independent as a deep one. Subclasses may add arbitrary state and
+        fall back to deepcopy.
+        """
+        if type(self) is not Character:
+            return copy.deepcopy(self)
+        clone = object.__new__(Character)
+        clone.__dict__.update(self.__dict__)
+        clone.skills = self.skills.copy()
+        return clone
+
+    def clone_many(self, n):
+        """Return n independent clones, hoisting the per-clone lookups out of the loop."""
+        if type(self) is not Character:
+            return [copy.deepcopy(self) for _ in range(n)]
+        state = self.__dict__
+        skills = self.skills
+        new = object.__new__
+        clones = []
+        for _ in range(n):
+            clone = new(Character)
+            clone_state = clone.__dict__
+            clone_state.update(state)
+            clone_state["skills"] = skills.copy()
+            clones.append(clone)
+        return clones
+
+    def deep_clone(self):
+        """Generic deepcopy-based clone, kept for comparison and for unusual subclasses."""
         return copy.deepcopy(self)
 
     def __str__(self):
@@ -34,17 +95,250 @@ class Character:
                 f"attack_power={self.attack_power}, skills={self.skills})")
 
 
+class PrototypeRegistry:
+    """Named prototypes that can be spawned by key."""
+
+    def __init__(self):
+        self._prototypes = {}
+
+    def register(self, key, prototype: Character):
+        self._prototypes[key] = prototype
+
+    def unregister(self, key):
+        self._prototypes.pop(key, None)
+
+    def _get(self, key) -> Character:
+        if key not in self._prototypes:
+            raise ValueError(f"No prototype registered for '{key}'")
+        return self._prototypes[key]
+
+    def spawn(self, key, **overrides) -> Character:
+        # Overrides follow the same rules as the constructor; validate before cloning.
+        # Subclasses with extra attributes add _validate_<attribute> rules for them.
+        prototype = self._get(key)
+        values = {attribute: prototype.validate(attribute, value) for attribute, value in overrides.items()}
+        clone = prototype.clone()
+        for attribute, value in values.items():
+            setattr(clone, attribute, value)
+        return clone
+
+    def spawn_many(self, key, n) -> list:
+        return self._get(key).clone_many(n)
+
+
+class CharacterPool:
+    """
+    Struct-of-arrays storage for large numbers of characters.
+
+    Health and attack power live in float64 arrays (so damage_all() can be
+    vectorised and take fractional amounts), which means pooled entities
+    report them as floats even when the prototype used ints. Names and
+    skill sets are interned once and referenced by id. Skill sets are shared tuples, so
+    changing one entity's skills swaps its id for another interned tuple
+    (copy-on-write) instead of mutating a list that others share.
+    """
+
+    def __init__(self):
+        self._health = array("d")
+        self._attack = array("d")
+        self._name_ids = array("I")
+        self._skill_ids = array("I")
+        self._names = []
+        self._name_lookup = {}
+        self._skill_sets = []
+        self._skill_lookup = {}
+
+    def __len__(self):
+        return len(self._health)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self._health)  # negative indices count from the end, as in a list
+        if not 0 <= index < len(self._health):
+            raise IndexError("CharacterPool index out of range")
+        return CharacterHandle(self, index)
+
+    def __iter__(self):
+        return (CharacterHandle(self, index) for index in range(len(self._health)))
+
+    def _intern_name(self, name):
+        name_id = self._name_lookup.get(name)
+        if name_id is None:
+            name_id = self._name_lookup[name] = len(self._names)
+            self._names.append(name)
+        return name_id
+
+    def _intern_skills(self, skills):
+        skills = tuple(skills)
+        skill_id = self._skill_lookup.get(skills)
+        if skill_id is None:
+            skill_id = self._skill_lookup[skills] = len(self._skill_sets)
+            self._skill_sets.append(skills)
+        return skill_id
+
+    def add(self, character: Character):
+        return self.spawn(character, 1)[0]
+
+    def spawn(self, prototype: Character, n):
+        """Append n copies of the prototype and return a range of their indices."""
+        start = len(self._health)
+        self._health.extend(array("d", [prototype.health]) * n)
+        self._attack.extend(array("d", [prototype.attack_power]) * n)
+        self._name_ids.extend(array("I", [self._intern_name(prototype.name)]) * n)
+        self._skill_ids.extend(array("I", [self._intern_skills(prototype.skills)]) * n)
+        return range(start, start + n)
+
+    def damage_all(self, amount):
+        """Apply damage to every entity at once, clamping health at zero."""
+        if np is not None:
+            health = np.frombuffer(self._health, dtype=np.float64)
+            np.subtract(health, amount, out=health)
+            np.maximum(health, 0.0, out=health)
+            return
+        self._health = array("d", [h - amount if h > amount else 0.0 for h in self._health])
+
+    def alive_count(self):
+        if np is not None:
+            return int(np.count_nonzero(np.frombuffer(self._health, dtype=np.float64)))
+        return len(self._health) - self._health.count(0.0)
+
+
+class CharacterHandle:
+    """
+    Lightweight view of one pooled entity exposing the Character API.
+    Assignments go through the same validation rules as Character.
+    """
+    __slots__ = ("_pool", "_index")
+
+    def __init__(self, pool: CharacterPool, index):
+        self._pool = pool
+        self._index = index
+
+    @property
+    def name(self):
+        return self._pool._names[self._pool._name_ids[self._index]]
+
+    @name.setter
+    def name(self, value):
+        self._pool._name_ids[self._index] = self._pool._intern_name(Character.validate("name", value))
+
+    @property
+    def health(self):
+        return self._pool._health[self._index]
+
+    @health.setter
+    def health(self, value):
+        self._pool._health[self._index] = Character.validate("health", value)
+
+    @property
+    def attack_power(self):
+        return self._pool._attack[self._index]
+
+    @attack_power.setter
+    def attack_power(self, value):
+        self._pool._attack[self._index] = Character.validate("attack_power", value)
+
+    @property
+    def skills(self):
+        # Shared tuple: edit through add_skill()/remove_skill() or assign a new list
+        return self._pool._skill_sets[self._pool._skill_ids[self._index]]
+
+    @skills.setter
+    def skills(self, value):
+        self._pool._skill_ids[self._index] = self._pool._intern_skills(Character.validate("skills", value))
+
+    def add_skill(self, skill):
+        self.skills = [*self.skills, skill]
+
+    def remove_skill(self, skill):
+        self.skills = [s for s in self.skills if s != skill]
+
+    def clone(self):
+        pool = self._pool
+        index = pool.spawn(self.to_character(), 1)[0]
+        return CharacterHandle(pool, index)
+
+    def to_character(self):
+        character = object.__new__(Character)
+        character.name = self.name
+        character.health = self.health
+        character.attack_power = self.attack_power
+        character.skills = list(self.skills)
+        return character
+
+    def __str__(self):
+        return (f"Character(name={self.name}, health={self.health}, "
+                f"attack_power={self.attack_power}, skills={list(self.skills)})")
+
+
+# --- Benchmark ---
+def benchmark_clone(n: int = 100_000):
+    prototype = Character("Warrior", 100, 20, ["Slash", "Block", "Parry", "Charge"])
+    timings = {
+        "deepcopy": timeit.timeit(prototype.deep_clone, number=n),
+        "clone": timeit.timeit(prototype.clone, number=n),
+        "clone_many": timeit.timeit(lambda: prototype.clone_many(n), number=1),
+    }
+    for label, seconds in timings.items():
+        print(f"{label:>10}: {n} clones in {seconds:.3f}s ({seconds / n * 1e9:.0f} ns/clone)")
+
+
+def benchmark_pool(n: int = 300_000):
+    prototype = Character("Goblin", 30, 5, ["Stab", "Flee"])
+
+    tracemalloc.start()
+    clones = prototype.clone_many(n)
+    objects_memory = tracemalloc.get_traced_memory()[0]
+    started = timeit.default_timer()
+    for clone in clones:
+        clone.health = max(0, clone.health - 7)
+    objects_damage = timeit.default_timer() - started
+    del clones
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    pool = CharacterPool()
+    pool.spawn(prototype, n)
+    pool_memory = tracemalloc.get_traced_memory()[0]
+    started = timeit.default_timer()
+    pool.damage_all(7)
+    pool_damage = timeit.default_timer() - started
+    tracemalloc.stop()
+
+    backend = "numpy" if np is not None else "array"
+    print(f"objects: {n} entities use {objects_memory / 1e6:.1f} MB, damage loop {objects_damage * 1000:.1f} ms")
+    print(f"pool:    {n} entities use {pool_memory / 1e6:.1f} MB, damage_all ({backend}) {pool_damage * 1000:.1f} ms")
+
+
 # --- Example Usage ---
-try:
-    base_character = Character("Warrior", 100, 20, ["Slash", "Block"])
-    print("Base:", base_character)
-
-    clone = base_character.clone()
-    clone.skills.append("Berserk")
-    clone.health = 120
-    clone.name = "Warrior Clone"
-
-    print("Clone:", clone)
-    print("Original:", base_character)
-except ValueError as e:
-    print("Validation Error:", e)
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_clone()
+        benchmark_pool()
+        sys.exit()
+
+    try:
+        base_character = Character("Warrior", 100, 20, ["Slash", "Block"])
+        print("Base:", base_character)
+
+        clone = base_character.clone()
+        clone.skills.append("Berserk")
+        clone.health = 120
+        clone.name = "Warrior Clone"
+
+        print("Clone:", clone)
+        print("Original:", base_character)
+
+        registry = PrototypeRegistry()
+        registry.register("warrior", base_character)
+        registry.register("mage", Character("Mage", 70, 35, ["Fireball"]))
+        print("Spawned:", registry.spawn("mage", name="Apprentice", health=50))
+        print("Horde size:", len(registry.spawn_many("warrior", 1000)))
+
+        pool = CharacterPool()
+        pool.spawn(base_character, 100_000)
+        pool.damage_all(30)
+        pool[0].add_skill("Berserk")  # copy-on-write: only entity 0 sees it
+        print("Pooled:", pool[0], "|", pool[1], "| alive:", pool.alive_count())
+    except ValueError as e:
+        print("Validation Error:", e)
@@ -1,78 +1,395 @@
-from abc import ABC, abstractmethod
+import io
+import math
+import os
+import struct
+import sys
+import time
+import zlib
+from abc import ABC
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from multiprocessing import shared_memory
 
 # =====================================================
 # Renderer Abstraction (generic, shape-agnostic)
 # =====================================================
 class Renderer(ABC):
-    @abstractmethod
+    """
+    Implementors override draw(), render(), or both. draw() prints the
+    rendering; render() returns it as a string so callers such as
+    draw_many() can batch the output. Renderers that only implement draw()
+    still work everywhere: render() captures what draw() prints.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.draw is Renderer.draw and cls.render is Renderer.render:
+            raise TypeError(f"{cls.__name__} must implement draw() or render()")
+
     def draw(self, shape: str, **data) -> None:
         """
         Render a shape described by:
         - shape: a string identifier ("circle", "square", "triangle", etc.)
         - data: shape-specific parameters
         """
-        pass
+        print(self.render(shape, **data))
+
+    def render(self, shape: str, **data) -> str:
+        """Like draw(), but return the output instead of printing it."""
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            self.draw(shape, **data)
+        return buffer.getvalue().removesuffix("\n")
+
+    def draw_many(self, shapes, out=None) -> None:
+        """
+        Render many shapes into one canvas buffer and flush it once.
+
+        Shapes are grouped by type so each group resolves its renderer once;
+        the canvas keeps the original order. Shapes are drawn with this
+        renderer regardless of the renderer they were built with.
+        """
+        groups = {}  # shape type -> (canvas slots, params)
+        for index, shape in enumerate(shapes):
+            kind, params = shape.describe()
+            slots, group_params = groups.setdefault(kind, ([], []))
+            slots.append(index)
+            group_params.append(params)
+
+        canvas = [""] * sum(len(slots) for slots, _ in groups.values())
+        for kind, (slots, group_params) in groups.items():
+            for index, output in zip(slots, self._render_group(kind, group_params)):
+                canvas[index] = output
+
+        out = out or sys.stdout
+        if canvas:
+            out.write("\n".join(canvas) + "\n")
+
+    def _render_group(self, shape: str, params_list) -> list[str]:
+        # Default: one render() call per shape; renderers can specialise this
+        return [self.render(shape, **params) for params in params_list]
 
 # =====================================================
 # Concrete Renderers
 # =====================================================
 class VectorRenderer(Renderer):
-    def draw(self, shape: str, **data) -> None:
-        print(f"Vector: Drawing {shape} with {data}")
+    def render(self, shape: str, **data) -> str:
+        return f"Vector: Drawing {shape} with {data}"
+
+# =====================================================
+# Raster Renderer backed by a real pixel framebuffer
+# =====================================================
+class Framebuffer:
+    """
+    Greyscale framebuffer, one byte per pixel. With shared=True the pixels
+    live in multiprocessing shared memory so worker processes can write
+    tiles into it in place; call close() to release it.
+    """
+
+    def __init__(self, width: int, height: int, shared: bool = False):
+        self.width = width
+        self.height = height
+        size = width * height
+        if shared:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self.pixels = self._shm.buf[:size]
+        else:
+            self._shm = None
+            self.pixels = memoryview(bytearray(size))
+
+    @property
+    def shared_name(self) -> str | None:
+        return self._shm.name if self._shm else None
+
+    def clear(self) -> None:
+        self.pixels[:] = bytes(len(self.pixels))
+
+    def save_ppm(self, path: str) -> None:
+        # Binary PPM (P6): the grey value repeated for R, G and B
+        rgb = bytearray(len(self.pixels) * 3)
+        rgb[0::3] = rgb[1::3] = rgb[2::3] = self.pixels
+        with open(path, "wb") as f:
+            f.write(f"P6\n{self.width} {self.height}\n255\n".encode())
+            f.write(rgb)
+
+    def save_png(self, path: str) -> None:
+        # 8-bit greyscale PNG; every scanline is prefixed with filter type 0
+        width = self.width
+        raw = b"".join(
+            b"\x00" + self.pixels[row * width:(row + 1) * width].tobytes()
+            for row in range(self.height)
+        )
+
+        def chunk(tag: bytes, data: bytes) -> bytes:
+            return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+            f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", self.width, self.height, 8, 0, 0, 0, 0)))
+            f.write(chunk(b"IDAT", zlib.compress(raw)))
+            f.write(chunk(b"IEND", b""))
+
+    def close(self) -> None:
+        self.pixels.release()
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+# Grey level per shape so overlapping shapes stay distinguishable in exports
+_INK = {"circle": 255, "square": 170, "triangle": 100}
+
+
+def _shape_size(shape: str, data: dict) -> tuple[int, int]:
+    if shape == "circle":
+        return 2 * data["radius"] + 1, 2 * data["radius"] + 1
+    if shape == "square":
+        return data["side"], data["side"]
+    if shape == "triangle":
+        return data["base"], data["height"]
+    raise ValueError(f"No raster implementation for {shape}")
+
+
+def _shape_spans(shape: str, x: int, y: int, data: dict):
+    """Yield (row, first column, last column) spans covering the shape."""
+    if shape == "circle":
+        radius = data["radius"]
+        for dy in range(-radius, radius + 1):
+            half = math.isqrt(radius * radius - dy * dy)
+            yield y + radius + dy, x + radius - half, x + radius + half
+    elif shape == "square":
+        for row in range(y, y + data["side"]):
+            yield row, x, x + data["side"] - 1
+    elif shape == "triangle":
+        # Same row widths as the ASCII triangle
+        base, height = data["base"], data["height"]
+        for i in range(1, height + 1):
+            width = base * i // height
+            if width:
+                yield y + i - 1, x, x + width - 1
+
+
+def _rasterise_tile(pixels, width: int, height: int, row_start: int, row_end: int, items) -> int:
+    """Fill the spans of every item that fall inside rows [row_start, row_end)."""
+    ink_rows = {shape: bytes([ink]) * width for shape, ink in _INK.items()}
+    filled = 0
+    for shape, x, y, data in items:
+        ink = ink_rows[shape]
+        for row, first, last in _shape_spans(shape, x, y, data):
+            if row < row_start or row >= row_end:
+                continue
+            first, last = max(first, 0), min(last, width - 1)
+            if first > last:
+                continue
+            offset = row * width
+            pixels[offset + first:offset + last + 1] = ink[:last - first + 1]
+            filled += last - first + 1
+    return filled
+
+
+def _rasterise_shared_tile(shm_name: str, width: int, height: int, row_start: int, row_end: int, items) -> int:
+    # Worker processes attach to the parent's framebuffer; nothing is copied back
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        pixels = shm.buf[:width * height]
+        try:
+            return _rasterise_tile(pixels, width, height, row_start, row_end, items)
+        finally:
+            pixels.release()
+    finally:
+        shm.close()
+
 
 class RasterRenderer(Renderer):
-    def draw(self, shape: str, **data) -> None:
-        print(f"Raster: Drawing pixels for {shape} with {data}")
+    """
+    Rasterises shapes into a Framebuffer. Shapes without an explicit x/y are
+    laid out left to right, wrapping onto new rows. With workers > 1,
+    draw_many() splits the canvas into horizontal tiles and fills them in
+    parallel worker processes, directly in shared memory.
+    """
+
+    PADDING = 2
+
+    def __init__(self, width: int = 128, height: int = 128, workers: int = 1, tile_height: int = 64):
+        self.framebuffer = Framebuffer(width, height, shared=workers > 1)
+        self.workers = workers
+        self.tile_height = tile_height
+        self._pool = None
+        self._cursor_x = self._cursor_y = self._row_height = 0
+
+    def render(self, shape: str, **data) -> str:
+        return f"Raster: Drawing pixels for {shape} with {data}"
+
+    def draw(self, shape: str, x: int | None = None, y: int | None = None, **data) -> None:
+        item = self._place(shape, x, y, data)
+        fb = self.framebuffer
+        _rasterise_tile(fb.pixels, fb.width, fb.height, 0, fb.height, [item])
+        print(self.render(shape, **data))
+
+    def draw_many(self, shapes, out=None) -> None:
+        items = []
+        for shape in shapes:
+            kind, data = shape.describe()
+            items.append(self._place(kind, None, None, data))
+        self.rasterise(items)
+
+    def rasterise(self, items) -> int:
+        """Rasterise (shape, x, y, data) items; returns the number of pixels written."""
+        fb = self.framebuffer
+        if self.workers <= 1:
+            return _rasterise_tile(fb.pixels, fb.width, fb.height, 0, fb.height, items)
+
+        # Bin each item into the tiles its bounding box overlaps
+        tile_height = self.tile_height
+        tiles = [[] for _ in range(math.ceil(fb.height / tile_height))]
+        for item in items:
+            shape, _, y, data = item
+            _, shape_height = _shape_size(shape, data)
+            first = max(y, 0) // tile_height
+            last = min(y + shape_height - 1, fb.height - 1) // tile_height
+            for tile in range(first, last + 1):
+                tiles[tile].append(item)
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        futures = [
+            self._pool.submit(
+                _rasterise_shared_tile, fb.shared_name, fb.width, fb.height,
+                index * tile_height, min((index + 1) * tile_height, fb.height), tile_items,
+            )
+            for index, tile_items in enumerate(tiles) if tile_items
+        ]
+        return sum(future.result() for future in futures)
+
+    def _place(self, shape: str, x, y, data: dict):
+        width, height = _shape_size(shape, data)
+        if x is None or y is None:
+            fb = self.framebuffer
+            if self._cursor_x + width > fb.width and self._cursor_x:
+                self._cursor_x = 0
+                self._cursor_y += self._row_height + self.PADDING
+                self._row_height = 0
+            if self._cursor_y + height > fb.height:
+                self._cursor_y = 0  # canvas full: start layering from the top again
+            x, y = self._cursor_x, self._cursor_y
+            self._cursor_x += width + self.PADDING
+            self._row_height = max(self._row_height, height)
+        return shape, x, y, data
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self.framebuffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
 # =====================================================
 # ASCII Renderer using dispatch table instead of if-else
 # =====================================================
 class ASCIIRenderer(Renderer):
+    GLYPH_CACHE_SIZE = 256
+
     def __init__(self):
-        # Map shape names to drawing functions
+        # Map shape names to rasterising functions
         self._draw_methods = {
             "circle": self._draw_circle,
             "square": self._draw_square,
             "triangle": self._draw_triangle,
         }
+        # (shape, params) -> finished glyph; repeated draws are a dict lookup
+        self._glyphs = {}
 
-    def draw(self, shape: str, **data) -> None:
-        # Lookup the shape in the dispatch table
+    def render(self, shape: str, **data) -> str:
+        return self._render_group(shape, [data])[0]
+
+    def _render_group(self, shape: str, params_list) -> list[str]:
+        # Lookup the shape in the dispatch table once for the whole group
         draw_func = self._draw_methods.get(shape)
-        if draw_func:
-            draw_func(**data)  # Call the appropriate drawing method
-        else:
-            print(f"(No ASCII implementation for {shape})")
+        if not draw_func:
+            return [f"(No ASCII implementation for {shape})"] * len(params_list)
+
+        glyphs = self._glyphs
+        output = []
+        for data in params_list:
+            key = (shape, *sorted(data.items()))
+            glyph = glyphs.get(key)
+            if glyph is None:
+                glyph = draw_func(**data)  # Call the appropriate rasterising method
+                if len(glyphs) >= self.GLYPH_CACHE_SIZE:
+                    glyphs.clear()
+                glyphs[key] = glyph
+            output.append(glyph)
+        return output
 
-    # Individual drawing methods
-    def _draw_circle(self, radius: int):
-        print("ASCII: Circle")
+    # Individual rasterising methods: each builds whole rows and returns one string
+    def _draw_circle(self, radius: int) -> str:
+        # Row y covers |x| <= isqrt(r^2 - y^2), so no per-cell test is needed
+        rows = ["ASCII: Circle"]
         for y in range(-radius, radius + 1):
-            for x in range(-radius, radius + 1):
-                print("*" if x*x + y*y <= radius*radius else " ", end="")
-            print()
+            half = math.isqrt(radius * radius - y * y)
+            pad = " " * (radius - half)
+            rows.append(pad + "*" * (2 * half + 1) + pad)
+        return "\n".join(rows)
 
-    def _draw_square(self, side: int):
-        print("ASCII: Square")
-        for _ in range(side):
-            print("*" * side)
+    def _draw_square(self, side: int) -> str:
+        return "\n".join(["ASCII: Square"] + ["*" * side] * side)
 
-    def _draw_triangle(self, base: int, height: int):
-        print("ASCII: Triangle")
+    def _draw_triangle(self, base: int, height: int) -> str:
+        rows = ["ASCII: Triangle"]
         for i in range(1, height + 1):
             width = base * i // height
-            print("*" * width)
+            rows.append("*" * width)
+        return "\n".join(rows)
 
 # =====================================================
 # Shape Abstraction (Bridge)
 # =====================================================
 class Shape(ABC):
+    """
+    Implementors override draw(), describe(), or both. describe() lets a
+    renderer batch shapes in draw_many(); a shape that only implements
+    draw() is described by recording the renderer call its draw() makes.
+    """
+
     def __init__(self, renderer: Renderer):
         self.renderer = renderer  # Bridge to renderer
 
-    @abstractmethod
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.draw is Shape.draw and cls.describe is Shape.describe:
+            raise TypeError(f"{cls.__name__} must implement draw() or describe()")
+
     def draw(self) -> None:
-        pass
+        shape, data = self.describe()
+        self.renderer.draw(shape, **data)
+
+    def describe(self) -> tuple[str, dict]:
+        """Return the shape's identity and the parameters a renderer needs."""
+        recorder = _RecordingRenderer()
+        renderer, self.renderer = self.renderer, recorder
+        try:
+            self.draw()
+        finally:
+            self.renderer = renderer
+        if recorder.call is None:
+            raise ValueError(f"{type(self).__name__}.draw() made no renderer call to describe")
+        return recorder.call
+
+
+class _RecordingRenderer(Renderer):
+    """Stands in for a shape's renderer to capture the draw() call it makes."""
+
+    def __init__(self):
+        self.call = None
+
+    def draw(self, shape: str, **data) -> None:
+        self.call = (shape, data)
 
 # =====================================================
 # Concrete Shapes (self-describing)
@@ -82,17 +399,17 @@ class Circle(Shape):
         super().__init__(renderer)
         self.radius = radius
 
-    def draw(self) -> None:
+    def describe(self) -> tuple[str, dict]:
         # Shape provides its identity and required parameters
-        self.renderer.draw("circle", radius=self.radius)
+        return "circle", {"radius": self.radius}
 
 class Square(Shape):
     def __init__(self, side: int, renderer: Renderer):
         super().__init__(renderer)
         self.side = side
 
-    def draw(self) -> None:
-        self.renderer.draw("square", side=self.side)
+    def describe(self) -> tuple[str, dict]:
+        return "square", {"side": self.side}
 
 class Triangle(Shape):
     def __init__(self, base: int, height: int, renderer: Renderer):
@@ -100,13 +417,70 @@ class Triangle(Shape):
         self.base = base
         self.height = height
 
-    def draw(self) -> None:
-        self.renderer.draw("triangle", base=self.base, height=self.height)
+    def describe(self) -> tuple[str, dict]:
+        return "triangle", {"base": self.base, "height": self.height}
+
+# =====================================================
+# Benchmark
+# =====================================================
+def benchmark_draw_many(count: int = 100_000):
+    for renderer in (VectorRenderer(), ASCIIRenderer()):
+        scene = [
+            (Circle(i % 5 + 1, renderer), Square(i % 4 + 1, renderer), Triangle(6, i % 3 + 2, renderer))[i % 3]
+            for i in range(count)
+        ]
+
+        sink = io.StringIO()
+        started = time.perf_counter()
+        with redirect_stdout(sink):
+            for shape in scene:
+                shape.draw()
+        per_shape = time.perf_counter() - started
+
+        canvas = io.StringIO()
+        started = time.perf_counter()
+        renderer.draw_many(scene, out=canvas)
+        batched = time.perf_counter() - started
+
+        assert canvas.getvalue() == sink.getvalue()
+        name = type(renderer).__name__
+        print(f"{name}: {count} shapes, draw() {per_shape * 1000:.0f} ms, draw_many() {batched * 1000:.0f} ms")
+
+
+def benchmark_raster(count: int = 100_000, size: int = 2048):
+    scene = [
+        (Circle(i % 9 + 2, None), Square(i % 12 + 3, None), Triangle(14, i % 8 + 4, None))[i % 3]
+        for i in range(count)
+    ]
+    core_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    reference = None
+    for workers in core_counts:
+        with RasterRenderer(size, size, workers=workers) as raster:
+            if workers > 1:
+                raster.rasterise([])  # exclude pool start-up from the timing
+                raster._pool.submit(int).result()
+            started = time.perf_counter()
+            raster.draw_many(scene)
+            elapsed = time.perf_counter() - started
+
+            pixels = raster.framebuffer.pixels.tobytes()
+            reference = reference or pixels
+            assert pixels == reference, "tiled output differs from single-process output"
+            print(f"RasterRenderer {size}x{size}, {workers} worker(s): {count} shapes in "
+                  f"{elapsed * 1000:.0f} ms ({count / elapsed:.0f} shapes/s)")
+            if "--export" in sys.argv and workers == 1:
+                raster.framebuffer.save_png("raster_bench.png")
+                raster.framebuffer.save_ppm("raster_bench.ppm")
 
 # =====================================================
 # Client Code / Demo
 # =====================================================
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_draw_many()
+        benchmark_raster()
+        sys.exit()
+
     # Instantiate renderers
     vector = VectorRenderer()
     raster = RasterRenderer()
@@ -129,3 +503,6 @@ if __name__ == "__main__":
     for shape in shapes:
         shape.draw()
         print("-" * 30)
+
+    # Batch the whole scene through one renderer and flush it once
+    ascii_renderer.draw_many(shapes)
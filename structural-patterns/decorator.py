@@ -1,19 +1,33 @@
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, TimeoutError as FutureTimeout
 
 # -----------------------------
 # Component Interface
 # -----------------------------
 class Notification(ABC):
     @abstractmethod
-    def send(self):
+    def send(self, message: str = ""):
         pass
 
+    def send_many(self, messages):
+        for message in messages:
+            self.send(message)
+
+
+def _describe(channel: str, message: str) -> str:
+    return f"Sending {channel} notification" + (f": {message}" if message else "")
+
 # -----------------------------
 # Concrete Component
 # -----------------------------
 class EmailNotification(Notification):
-    def send(self):
-        print("Sending Email notification")
+    channel = "Email"
+
+    def send(self, message: str = ""):
+        print(_describe("Email", message))
 
 # -----------------------------
 # Base Decorator
@@ -22,23 +36,44 @@ class NotificationDecorator(Notification):
     def __init__(self, wrapped_notification: Notification):
         self._wrapped = wrapped_notification
 
-    def send(self):
-        # Delegate to the wrapped notification
-        self._wrapped.send()
+    def send(self, message: str = ""):
+        # Delegate to the wrapped notification, surrounded by this decorator's hooks
+        self.before_send(message)
+        self._wrapped.send(message)
+        self.after_send(message)
+
+    def before_send(self, message: str) -> None:
+        """Runs before the wrapped notification is sent."""
+
+    def after_send(self, message: str) -> None:
+        """Runs after the wrapped notification has been sent."""
+
+class ChannelDecorator(NotificationDecorator):
+    """A decorator that delivers through one independent channel after the wrapped send."""
+    channel = None
+
+    def after_send(self, message: str) -> None:
+        self.deliver(message)
+
+    @abstractmethod
+    def deliver(self, message: str) -> None:
+        pass
 
 # -----------------------------
 # Concrete Decorators
 # -----------------------------
-class SMSDecorator(NotificationDecorator):
-    def send(self):
-        super().send()
-        print("Sending SMS notification")
+class SMSDecorator(ChannelDecorator):
+    channel = "SMS"
 
+    def deliver(self, message: str) -> None:
+        print(_describe("SMS", message))
 
-class PushDecorator(NotificationDecorator):
-    def send(self):
-        super().send()
-        print("Sending Push notification")
+
+class PushDecorator(ChannelDecorator):
+    channel = "Push"
+
+    def deliver(self, message: str) -> None:
+        print(_describe("Push", message))
 
 # -----------------------------
 # Logging Decorator (Twist)
@@ -48,10 +83,188 @@ class LoggingDecorator(NotificationDecorator):
         super().__init__(wrapped_notification)
         self.notification_type = notification_type
 
-    def send(self):
+    def before_send(self, message: str) -> None:
         # Log BEFORE sending
         print(f"[LOG] Notification type: {self.notification_type}")
-        super().send()
+
+# -----------------------------
+# Compiled Pipeline
+# -----------------------------
+class NotificationPipeline(Notification):
+    """A decorator stack flattened into one ordered list of steps."""
+
+    def __init__(self, steps):
+        self._steps = tuple(steps)
+
+    def send(self, message: str = ""):
+        for step in self._steps:
+            step(message)
+
+    def send_many(self, messages):
+        steps = self._steps
+        for message in messages:
+            for step in steps:
+                step(message)
+
+
+def _unwrap(notification: Notification):
+    """
+    Split a decorator stack into its hook-based decorators (outermost first)
+    and the core they wrap. A decorator that overrides send() itself can't be
+    split into hooks, so it becomes the core for the rest of the chain.
+    """
+    decorators = []
+    node = notification
+    while isinstance(node, NotificationDecorator) and type(node).send is NotificationDecorator.send:
+        decorators.append(node)
+        node = node._wrapped
+    return decorators, node
+
+
+def _overrides(decorator: NotificationDecorator, hook: str) -> bool:
+    return getattr(type(decorator), hook) is not getattr(NotificationDecorator, hook)
+
+
+def compile_pipeline(notification: Notification) -> NotificationPipeline:
+    """
+    Flatten a decorator stack into pre steps (outermost first), the core
+    send, and post steps (innermost first), which is exactly the order the
+    nested send() calls run in.
+    """
+    decorators, core = _unwrap(notification)
+    pre_steps = [d.before_send for d in decorators if _overrides(d, "before_send")]
+    post_steps = [d.after_send for d in reversed(decorators) if _overrides(d, "after_send")]
+    return NotificationPipeline(pre_steps + [core.send] + post_steps)
+
+# -----------------------------
+# Concurrent Fan-out
+# -----------------------------
+class ChannelResult:
+    def __init__(self, channel: str, status: str, latency: float, error: Exception | None = None):
+        self.channel = channel
+        self.status = status  # "ok", "error", "timeout" or "busy"
+        self.latency = latency
+        self.error = error
+
+    def __repr__(self):
+        detail = f", error={self.error!r}" if self.error else ""
+        return f"ChannelResult({self.channel}, {self.status}, {self.latency * 1000:.1f} ms{detail})"
+
+
+class _ChannelWorker:
+    """
+    One daemon thread running a channel's deliveries in order. Unlike
+    ThreadPoolExecutor workers, which the interpreter joins at exit, a
+    daemon thread stuck in a hung channel can't keep the process alive.
+    """
+
+    def __init__(self, name: str):
+        self._jobs = queue.SimpleQueue()
+        threading.Thread(target=self._run, name=f"fan-out-{name}", daemon=True).start()
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        self._jobs.put((future, fn, args))
+        return future
+
+    def _run(self):
+        while (job := self._jobs.get()) is not None:
+            future, fn, args = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as exc:
+                future.set_exception(exc)
+
+    def shutdown(self):
+        # The thread exits after its current delivery; nothing waits for it
+        self._jobs.put(None)
+
+
+class FanOutNotification(Notification):
+    """
+    Sends through every channel of a decorator stack in parallel.
+
+    before_send hooks (logging) still run first and in stack order, and
+    non-channel after_send hooks run in order once the channels finish.
+    The core notification and each ChannelDecorator run concurrently, each
+    on its own daemon worker thread and with its own timeout, so one
+    channel failing or hanging never affects the others, nor delays
+    interpreter exit. A channel whose
+    previous delivery is still running is reported as "busy" instead of
+    queueing more work behind it. End-to-end latency is therefore the
+    slowest channel rather than the sum of all of them.
+    """
+
+    def __init__(self, notification: Notification, timeouts: dict[str, float] | None = None,
+                 default_timeout: float = 5.0):
+        decorators, core = _unwrap(notification)
+        self._pre_steps = [d.before_send for d in decorators if _overrides(d, "before_send")]
+        self._channels = [(getattr(core, "channel", None) or type(core).__name__, core.send)]
+        self._post_steps = []
+        for decorator in reversed(decorators):
+            if isinstance(decorator, ChannelDecorator):
+                self._channels.append((decorator.channel or type(decorator).__name__, decorator.deliver))
+            elif _overrides(decorator, "after_send"):
+                self._post_steps.append(decorator.after_send)
+
+        self._timeouts = timeouts or {}
+        self._default_timeout = default_timeout
+        self._workers = [_ChannelWorker(channel) for channel, _ in self._channels]
+        self._in_flight = [None] * len(self._channels)  # last future per channel
+
+    def send(self, message: str = "") -> list[ChannelResult]:
+        for step in self._pre_steps:
+            step(message)
+
+        started = time.perf_counter()
+        pending = []
+        for index, (channel, deliver) in enumerate(self._channels):
+            previous = self._in_flight[index]
+            if previous is not None and not previous.done():
+                # Still stuck on an earlier message: don't queue behind it
+                pending.append((channel, None, started))
+                continue
+            future = self._workers[index].submit(self._timed, deliver, message)
+            self._in_flight[index] = future
+            pending.append((channel, future, started + self._timeouts.get(channel, self._default_timeout)))
+
+        results = []
+        for channel, future, deadline in pending:
+            if future is None:
+                results.append(ChannelResult(channel, "busy", 0.0))
+                continue
+            try:
+                latency, error = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+            except FutureTimeout:
+                results.append(ChannelResult(channel, "timeout", time.perf_counter() - started))
+                continue
+            results.append(ChannelResult(channel, "error" if error else "ok", latency, error))
+
+        for step in self._post_steps:
+            step(message)
+        return results
+
+    @staticmethod
+    def _timed(deliver, message):
+        started = time.perf_counter()
+        try:
+            deliver(message)
+        except Exception as exc:  # isolate the failure to this channel
+            return time.perf_counter() - started, exc
+        return time.perf_counter() - started, None
+
+    def close(self):
+        # Don't wait for channels that already timed out
+        for worker in self._workers:
+            worker.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
 # -----------------------------
 # Client Code
@@ -69,3 +282,28 @@ if __name__ == "__main__":
 
     # Send notification through all channels
     notification.send()
+
+    # Same stack, flattened into a single loop
+    print("\n--- Compiled pipeline ---")
+    pipeline = compile_pipeline(notification)
+    pipeline.send_many(["Server restarted", "Backup finished"])
+
+    # Channels fan out in parallel; logging still happens first, in order
+    print("\n--- Concurrent fan-out ---")
+
+    class SlowSMSDecorator(SMSDecorator):
+        def deliver(self, message: str) -> None:
+            time.sleep(0.3)  # simulated carrier latency
+            super().deliver(message)
+
+    class FlakyPushDecorator(PushDecorator):
+        def deliver(self, message: str) -> None:
+            time.sleep(0.2)
+            raise ConnectionError("push gateway unavailable")
+
+    stack = LoggingDecorator(FlakyPushDecorator(SlowSMSDecorator(EmailNotification())), "All channels")
+    with FanOutNotification(stack, timeouts={"SMS": 1.0}) as fan_out:
+        started = time.perf_counter()
+        for result in fan_out.send("Deploy complete"):
+            print(result)
+        print(f"End-to-end: {(time.perf_counter() - started) * 1000:.0f} ms (sequential would be ~500 ms)")
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
 
 # ===== Subsystems =====
@@ -39,6 +41,279 @@ class Music(ElectricDevice):
     def play_song(self, song: str) -> None:
         print(f"Playing: {song}")
 
+class SimulatedSlowDevice:
+    """Wraps a device so every command takes `latency` seconds, like real hardware."""
+
+    def __init__(self, device: ElectricDevice, latency: float):
+        self._device = device
+        self._latency = latency
+
+    def __getattr__(self, name):
+        command = getattr(self._device, name)
+
+        async def slow_command(*args):
+            await asyncio.sleep(self._latency)
+            return command(*args)
+        return slow_command
+
+# ===== Scene Plans =====
+
+class Command:
+    """One device call in a scene, plus the names of the steps it must follow."""
+
+    def __init__(self, name: str, device: str, action: str, *args, after: tuple = ()):
+        self.name = name
+        self.device = device
+        self.action = action
+        self.args = args
+        self.after = tuple(after)
+
+    def __repr__(self):
+        return f"Command({self.name}: {self.device}.{self.action}{self.args})"
+
+
+class ScenePlan:
+    """An ordered set of commands with declared dependencies, validated up front."""
+
+    def __init__(self, name: str, commands, description: str | None = None):
+        self.name = name
+        self.description = description
+        self.commands = self._topological_order(list(commands))
+
+    @staticmethod
+    def _topological_order(commands):
+        by_name = {command.name: command for command in commands}
+        if len(by_name) != len(commands):
+            raise ValueError("Command names in a scene must be unique")
+        for command in commands:
+            for dependency in command.after:
+                if dependency not in by_name:
+                    raise ValueError(f"'{command.name}' depends on unknown step '{dependency}'")
+
+        ordered, visiting, done = [], set(), set()
+
+        def visit(command):
+            if command.name in done:
+                return
+            if command.name in visiting:
+                raise ValueError(f"Dependency cycle at step '{command.name}'")
+            visiting.add(command.name)
+            for dependency in command.after:
+                visit(by_name[dependency])
+            visiting.discard(command.name)
+            done.add(command.name)
+            ordered.append(command)
+
+        for command in commands:
+            visit(command)
+        return ordered
+
+
+class StepResult:
+    def __init__(self, name: str, status: str, started: float, finished: float, error: Exception | None = None):
+        self.name = name
+        self.status = status  # "ok", "error" or "skipped"
+        self.started = started  # seconds since the scene started
+        self.finished = finished
+        self.error = error
+
+    @property
+    def latency(self) -> float:
+        return self.finished - self.started
+
+    def __repr__(self):
+        return (f"StepResult({self.name}, {self.status}, "
+                f"start={self.started * 1000:.0f} ms, latency={self.latency * 1000:.0f} ms)")
+
+
+class AsyncSceneExecutor:
+    """
+    Runs a ScenePlan with every command starting as soon as its dependencies
+    finish, so independent devices are driven concurrently. Commands on the
+    same device are still serialised. Sync device methods run in a worker
+    thread; async ones (e.g. network drivers) are awaited directly. If a
+    step fails (including an action the device doesn't support), the steps
+    that depend on it are skipped. Plans naming an unknown device are
+    rejected before any command runs.
+    """
+
+    def __init__(self, devices: dict):
+        self._devices = devices
+
+    async def run(self, plan: ScenePlan) -> list[StepResult]:
+        for command in plan.commands:
+            if command.device not in self._devices:
+                raise ValueError(f"Unknown device '{command.device}' in step '{command.name}'")
+
+        scene_start = time.perf_counter()
+        device_locks = {name: asyncio.Lock() for name in self._devices}
+        tasks = {}
+
+        async def run_step(command: Command) -> StepResult:
+            dependencies = [await tasks[name] for name in command.after]
+            now = time.perf_counter() - scene_start
+            if any(result.status != "ok" for result in dependencies):
+                return StepResult(command.name, "skipped", now, now)
+
+            async with device_locks[command.device]:
+                started = time.perf_counter() - scene_start
+                try:
+                    method = getattr(self._devices[command.device], command.action)
+                    if asyncio.iscoroutinefunction(method):
+                        await method(*command.args)
+                    else:
+                        await asyncio.to_thread(method, *command.args)
+                except Exception as exc:
+                    return StepResult(command.name, "error", started, time.perf_counter() - scene_start, exc)
+                return StepResult(command.name, "ok", started, time.perf_counter() - scene_start)
+
+        # Plans are topologically ordered, so every dependency's task already exists
+        for command in plan.commands:
+            tasks[command.name] = asyncio.ensure_future(run_step(command))
+        return list(await asyncio.gather(*tasks.values()))
+
+# ===== Device State & Coalescing =====
+
+class DeviceState:
+    """
+    Last known state of one device: power plus the latest value of each
+    setting. power is None while it's unknown (never commanded, or a
+    command failed part-way), in which case nothing is assumed about it.
+    """
+
+    # Actions that set a value, so sending the same value twice changes nothing.
+    # Anything else (play_song) is an event and is sent every time it's requested.
+    CACHEABLE_ACTIONS = frozenset({"set_temperature"})
+
+    def __init__(self, power: bool | None = None, settings: dict | None = None):
+        self.power = power
+        self.settings = dict(settings or {})  # action name -> args tuple
+
+    def copy(self) -> "DeviceState":
+        return DeviceState(self.power, self.settings)
+
+    def apply(self, action: str, args: tuple) -> None:
+        if action == "on":
+            self.power = True
+        elif action == "off":
+            # Don't assume settings survive a power cycle; resend them on the next "on"
+            self.power = False
+            self.settings.clear()
+        elif action in self.CACHEABLE_ACTIONS:
+            self.settings[action] = args
+
+    def __repr__(self):
+        power = "unknown" if self.power is None else "on" if self.power else "off"
+        return f"DeviceState(power={power}, settings={self.settings})"
+
+
+class CoalescerStats:
+    def __init__(self):
+        self.scenes_requested = 0
+        self.scenes_debounced = 0  # scenes merged into a later one before running
+        self.commands_requested = 0
+        self.commands_sent = 0
+
+    @property
+    def commands_saved(self) -> int:
+        return self.commands_requested - self.commands_sent
+
+    def __repr__(self):
+        return (f"CoalescerStats(scenes={self.scenes_requested}, debounced={self.scenes_debounced}, "
+                f"commands={self.commands_requested}, sent={self.commands_sent}, saved={self.commands_saved})")
+
+
+class CommandCoalescer:
+    """
+    Reduces a command sequence to the minimal plan that takes the devices
+    from their cached state to the sequence's final state. Commands that
+    change nothing (turning on a light that is already on) or that cancel
+    each other out (on then off) are dropped, and settings and events sent
+    to a device that ends up off are dropped with it. Surviving commands
+    keep their names and declared dependencies; a dependency on a dropped
+    step is replaced by that step's own (surviving) dependencies.
+    """
+
+    def __init__(self, device_names):
+        # Nothing is known until we've commanded a device, so its first commands are always sent
+        self.states = {name: DeviceState() for name in device_names}
+        self.stats = CoalescerStats()
+
+    def coalesce(self, name: str, commands, description: str | None = None) -> ScenePlan:
+        # `commands` must be in dependency order, as ScenePlan.commands is
+        commands = list(commands)
+        self.stats.commands_requested += len(commands)
+
+        targets = {}
+        last_index = {}  # (device, action) -> index of its last occurrence
+        for index, command in enumerate(commands):
+            if command.device not in self.states:
+                raise ValueError(f"Unknown device '{command.device}' in step '{command.name}'")
+            if command.device not in targets:
+                targets[command.device] = self.states[command.device].copy()
+            targets[command.device].apply(command.action, command.args)
+            last_index[command.device, command.action] = index
+
+        kept = []
+        powered_on = set()  # devices whose surviving "on" has already been chosen
+        for index, command in enumerate(commands):
+            device, action = command.device, command.action
+            current, target = self.states[device], targets[device]
+            after_last_off = index > last_index.get((device, "off"), -1)
+            if action == "off":
+                keep = target.power is False and current.power is not False and index == last_index[device, "off"]
+            elif target.power is False or not after_last_off:
+                keep = False  # cancelled by a later "off"
+            elif action == "on":
+                keep = current.power is not True and device not in powered_on
+                powered_on.add(device)
+            elif action in DeviceState.CACHEABLE_ACTIONS:
+                keep = (index == last_index[device, action]
+                        and current.settings.get(action) != command.args)
+            else:
+                keep = True
+            if keep:
+                kept.append(command)
+
+        by_name = {command.name: command for command in commands}
+        kept_names = {command.name for command in kept}
+        resolved = {}
+
+        def resolve(step):
+            # The surviving steps a dependency on `step` stands for
+            if step in kept_names:
+                return (step,)
+            if step not in resolved:
+                resolved[step] = tuple(dict.fromkeys(
+                    name for dependency in by_name[step].after for name in resolve(dependency)))
+            return resolved[step]
+
+        reduced = []
+        previous_step = {}
+        for command in kept:
+            after = dict.fromkeys(name for dependency in command.after for name in resolve(dependency))
+            # Keep the original order of the commands a device still receives
+            if command.device in previous_step:
+                after[previous_step[command.device]] = None
+            previous_step[command.device] = command.name
+            reduced.append(Command(command.name, command.device, command.action, *command.args,
+                                   after=tuple(after)))
+
+        self.stats.commands_sent += len(reduced)
+        return ScenePlan(name, reduced, description)
+
+    def record(self, plan: ScenePlan, results: list[StepResult]) -> None:
+        """
+        Update the cached state with the commands that actually succeeded.
+        A failed command leaves its device in an unknown state.
+        """
+        status = {result.name: result.status for result in results}
+        for command in plan.commands:
+            if status.get(command.name) == "ok":
+                self.states[command.device].apply(command.action, command.args)
+            elif status.get(command.name) == "error":
+                self.states[command.device] = DeviceState()
+
 # ===== Facade =====
 
 class SmartHomeFacade:
@@ -47,37 +322,130 @@ class SmartHomeFacade:
     simple, high-level operations to the client.
     """
 
-    def __init__(self):
-        self._lights = Lights()
-        self._ac = AC()
-        self._music = Music()
-
-    def start_party(self) -> None:
-        print("\n--- Party Mode ---")
-        self._lights.on()
-        self._ac.on()
-        self._ac.set_temperature(21)
-        self._music.on()
-        self._music.play_song("Party Anthem")
-
-    def end_party(self) -> None:
-        print("\n--- Party Over ---")
-        self._music.off()
-        self._ac.off()
-        self._lights.off()
-
-    def vacation_mode(self) -> None:
-        print("\n--- Vacation Mode ---")
-        print("Simulating presence while away...")
-        self._lights.on()
-        self._ac.on()
-        self._ac.set_temperature(26)
-        self._lights.off()
-        self._ac.off()
+    PARTY = ScenePlan("Party Mode", [
+        Command("lights_on", "lights", "on"),
+        Command("ac_on", "ac", "on"),
+        Command("ac_temperature", "ac", "set_temperature", 21, after=("ac_on",)),
+        Command("music_on", "music", "on"),
+        Command("play_song", "music", "play_song", "Party Anthem", after=("music_on",)),
+    ])
+
+    END_PARTY = ScenePlan("Party Over", [
+        Command("music_off", "music", "off"),
+        Command("ac_off", "ac", "off"),
+        Command("lights_off", "lights", "off"),
+    ])
+
+    VACATION = ScenePlan("Vacation Mode", [
+        Command("lights_on", "lights", "on"),
+        Command("ac_on", "ac", "on"),
+        Command("ac_temperature", "ac", "set_temperature", 26, after=("ac_on",)),
+        Command("lights_off", "lights", "off", after=("lights_on",)),
+        Command("ac_off", "ac", "off", after=("ac_temperature",)),
+    ], description="Simulating presence while away...")
+
+    def __init__(self, lights=None, ac=None, music=None, debounce: float = 0.25):
+        self._lights = lights or Lights()
+        self._ac = ac or AC()
+        self._music = music or Music()
+        devices = {
+            "lights": self._lights,
+            "ac": self._ac,
+            "music": self._music,
+        }
+        self._executor = AsyncSceneExecutor(devices)
+        self._coalescer = CommandCoalescer(devices)
+        self._debounce = debounce
+        self._pending = []  # scenes waiting out the debounce window
+        self._generation = 0
+
+    @property
+    def stats(self) -> CoalescerStats:
+        return self._coalescer.stats
+
+    def device_state(self, device: str) -> DeviceState:
+        return self._coalescer.states[device].copy()
+
+    def run_scene(self, plan: ScenePlan) -> list[StepResult]:
+        return asyncio.run(self.run_scene_async(plan))
+
+    async def run_scene_async(self, plan: ScenePlan) -> list[StepResult]:
+        self._coalescer.stats.scenes_requested += 1
+        return await self._run_commands(plan.name, plan.commands, plan.description)
+
+    async def request_scene(self, plan: ScenePlan) -> list[StepResult] | None:
+        """
+        Debounced scene change: scenes requested within the debounce window
+        of each other are merged and run once, as a single coalesced plan.
+        Returns None for a request that was merged into a later one.
+        """
+        self._coalescer.stats.scenes_requested += 1
+        self._pending.append(plan)
+        self._generation += 1
+        generation = self._generation
+
+        await asyncio.sleep(self._debounce)
+        if generation != self._generation:
+            return None  # a later request will run the merged scenes
+
+        plans, self._pending = self._pending, []
+        self._coalescer.stats.scenes_debounced += len(plans) - 1
+        # Prefix step names so identically named steps from different scenes stay distinct
+        commands = [
+            Command(f"{i}.{command.name}", command.device, command.action, *command.args,
+                    after=tuple(f"{i}.{dependency}" for dependency in command.after))
+            for i, pending in enumerate(plans, 1)
+            for command in pending.commands
+        ]
+        return await self._run_commands(" + ".join(p.name for p in plans), commands, plans[-1].description)
+
+    async def _run_commands(self, name: str, commands, description: str | None) -> list[StepResult]:
+        print(f"\n--- {name} ---")
+        if description:
+            print(description)
+        plan = self._coalescer.coalesce(name, commands, description)
+        if not plan.commands:
+            print("(devices already in the requested state)")
+        results = await self._executor.run(plan)
+        self._coalescer.record(plan, results)
+        return results
+
+    def start_party(self) -> list[StepResult]:
+        return self.run_scene(self.PARTY)
+
+    def end_party(self) -> list[StepResult]:
+        return self.run_scene(self.END_PARTY)
+
+    def vacation_mode(self) -> list[StepResult]:
+        return self.run_scene(self.VACATION)
 
 # ===== Client Code =====
 
-home = SmartHomeFacade()
-home.start_party()
-home.end_party()
-home.vacation_mode()
+if __name__ == "__main__":
+    home = SmartHomeFacade()
+    home.start_party()
+    home.end_party()
+    home.vacation_mode()
+
+    # Devices that take 300 ms per command: independent ones overlap
+    slow_home = SmartHomeFacade(
+        lights=SimulatedSlowDevice(Lights(), 0.3),
+        ac=SimulatedSlowDevice(AC(), 0.3),
+        music=SimulatedSlowDevice(Music(), 0.3),
+    )
+    started = time.perf_counter()
+    for step in slow_home.start_party():
+        print(step)
+    print(f"Scene took {(time.perf_counter() - started) * 1000:.0f} ms (sequential would be ~1500 ms)")
+
+    # Repeating a scene only replays the song; rapid changes collapse into one plan
+    slow_home.start_party()
+
+    async def flip_scenes():
+        return await asyncio.gather(
+            slow_home.request_scene(SmartHomeFacade.END_PARTY),
+            slow_home.request_scene(SmartHomeFacade.PARTY),
+            slow_home.request_scene(SmartHomeFacade.VACATION),
+        )
+    asyncio.run(flip_scenes())
+    print("\nCommand savings:", slow_home.stats)